@@ -2,8 +2,26 @@
 # Copyright (C) 2026 [Your Name]
 # Licensed under GPL-3.0-only
 
-from ..core.signal_validator import validate_signal
+from functools import lru_cache
+
+from ..core.signal_validator import batch_validator, validate_signal
 from ..protocols.vma_signer import sign_with_vma_if_needed
+from ..utils import tracing
+
+SHORT_MEMORY_SIZE = 5
+# Граница кэша классификации intent: intent приходят от игровых серверов как есть
+INTENT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=INTENT_CACHE_SIZE)
+def _classify_intent(intent):
+    # Простая реактивная логика
+    if "query" in intent:
+        return "offer_option"
+    elif "request" in intent:
+        return "commit_action"
+    else:
+        return "acknowledge"
 
 
 class BehavMod:
@@ -19,6 +37,10 @@ class BehavMod:
 
     def process(self, raw_signal):
         """Обработка сигнала с акцентом на быстрый вывод."""
+        with tracing.span("behav_mod.process"):
+            return self._process(raw_signal)
+
+    def _process(self, raw_signal):
         if not validate_signal(raw_signal, schema="signal-schema.json"):
             raise ValueError("Invalid input signal for BehavMod")
 
@@ -34,6 +56,49 @@ class BehavMod:
 
         return fast_response
 
+    def process_batch(self, raw_signals):
+        """Пакетная обработка всплеска сигналов (например, за один игровой тик).
+
+        Результат идентичен последовательным вызовам process(), в том числе при ошибке:
+        краткосрочная память получает излучения всех сигналов до сбойного, после чего
+        исключение пробрасывается. Схема и валидатор загружаются один раз на пакет.
+        """
+        signals = list(raw_signals)
+        with tracing.span("behav_mod.process_batch", batch_size=len(signals)):
+            return self._process_batch(signals)
+
+    def _process_batch(self, signals):
+        is_valid = batch_validator(schema="signal-schema.json")
+        # Ошибка валидации запоминается вместе с позицией: сигналы до неё обрабатываются
+        failure, valid_count = None, len(signals)
+        for index, signal in enumerate(signals):
+            try:
+                if is_valid(signal):
+                    continue
+                failure = ValueError("Invalid input signal for BehavMod")
+            except Exception as exc:
+                failure = exc
+            valid_count = index
+            break
+
+        emissions = []
+        base_emissions = []
+        try:
+            for signal in signals[:valid_count]:
+                base_emission = self._build_emission(self._simulate_slow_context(signal))
+                base_emissions.append(base_emission)
+                if self._is_high_stakes(base_emission):
+                    emissions.append(sign_with_vma_if_needed(base_emission, profile=self.profile))
+                else:
+                    emissions.append(base_emission)
+        finally:
+            # Одно обновление памяти на пакет — с теми же записями, что и при process()
+            self._remember(base_emissions)
+
+        if failure is not None:
+            raise failure
+        return emissions
+
     def _simulate_slow_context(self, signal):
         # Имитация глубокого контекста на основе профиля и истории
         recent = self.context_short_memory[-3:] if self.context_short_memory else []
@@ -45,28 +110,30 @@ class BehavMod:
         }
 
     def _noema_fast_emit(self, context):
+        base_emission = self._build_emission(context)
+        # Сохраняем в краткосрочную память
+        self._remember([base_emission])
+        return base_emission
+
+    def _build_emission(self, context):
         # Генерация быстрого онтологического излучения (onto16r-совместимого)
-        base_emission = {
+        return {
             "intent_response": self._choose_intent_response(context),
             "urgency": "high" if context["social_proximity"] == "close" else "medium",
             "energy_state": self._estimate_energy(context),
             "timestamp": context.get("signal_timestamp", None)
         }
-        # Сохраняем в краткосрочную память
-        self.context_short_memory.append(base_emission)
-        if len(self.context_short_memory) > 5:
-            self.context_short_memory.pop(0)
-        return base_emission
+
+    def _remember(self, emissions):
+        self.context_short_memory.extend(emissions)
+        del self.context_short_memory[:-SHORT_MEMORY_SIZE]
 
     def _choose_intent_response(self, ctx):
-        # Простая реактивная логика
         intent = ctx["signal_intent"]
-        if "query" in intent:
-            return "offer_option"
-        elif "request" in intent:
-            return "commit_action"
-        else:
-            return "acknowledge"
+        if isinstance(intent, str):
+            return _classify_intent(intent)
+        # Нехэшируемые и прочие значения — без кэша, с тем же поведением
+        return _classify_intent.__wrapped__(intent)
 
     def _estimate_energy(self, ctx):
         # Энергия как функция социальной близости и активности (без численной оценки!)
@@ -2,8 +2,13 @@
 # Copyright (C) 2026 [Your Name]
 # Licensed under GPL-3.0-only
 
+from ..core.ontic_index import OnticFactIndex
 from ..core.signal_validator import validate_signal
 from ..protocols.vma_signer import sign_with_vma_if_needed
+from ..utils import tracing
+
+
+HIGH_STAKES_TERMS = ("medical", "consent", "transaction", "identity")
 
 
 class OntoRichness:
@@ -16,17 +21,28 @@ class OntoRichness:
         self.profile = profile
         self.mode = "reflective"
         self.causal_buffer = []
+        # Окно фактов совпадает с глубиной каузального буфера
+        self.fact_index = OnticFactIndex(window=10, flag_terms=HIGH_STAKES_TERMS)
 
     def process(self, raw_signal):
         """Обработка входного сигнала через рефлексивную петлю."""
+        with tracing.span("onto_richness.process"):
+            return self._process(raw_signal)
+
+    def _process(self, raw_signal):
         if not validate_signal(raw_signal, schema="signal-schema.json"):
             raise ValueError("Invalid input signal for OntoRichness")
 
         # Шаг 1: Быстрое восприятие (NoemaFast)
         fast_context = self._noema_fast_decode(raw_signal)
 
+        # Индексация ontic_facts и признаков fast-контекста (интернирование строк);
+        # окно индекса движется синхронно с causal_buffer
+        terms = [str(value) for value in fast_context.values() if value is not None]
+        seq = self.fact_index.add(raw_signal, terms=terms)
+
         # Шаг 2: Погружение в каузальную реконструкцию (NoemaSlow)
-        slow_context = self._noema_slow_reconstruct(fast_context)
+        slow_context = self._noema_slow_reconstruct(fast_context, seq)
 
         # Шаг 3: Этическая фильтрация через VMA (если high-stakes)
         if self._is_high_stakes(slow_context):
@@ -43,7 +59,7 @@ class OntoRichness:
             "timestamp": signal.get("ts")
         }
 
-    def _noema_slow_reconstruct(self, fast_context):
+    def _noema_slow_reconstruct(self, fast_context, seq):
         # Восстановление причинно-следственных связей
         self.causal_buffer.append(fast_context)
         if len(self.causal_buffer) > 10:
@@ -52,6 +68,8 @@ class OntoRichness:
         # Пример: взвешенная реконструкция истории
         reconstructed = {
             "causal_chain": self.causal_buffer.copy(),
+            # Сигналы окна, связанные с текущим общими объектами фактов
+            "causal_links": self.fact_index.related(seq),
             "stability_score": self._compute_stability(),
             "reflective_verdict": self._generate_verdict()
         }
@@ -66,8 +84,7 @@ class OntoRichness:
         return "reflective_accept" if self._compute_stability() > 0.7 else "causal_inquiry_needed"
 
     def _is_high_stakes(self, context):
-        # Определяет, требует ли контекст VMA-подписи
-        return any(
-            key in str(context).lower() 
-            for key in ("medical", "consent", "transaction", "identity")
-        )
\ No newline at end of file
+        # Определяет, требует ли контекст VMA-подписи.
+        # Все строки каузальной цепочки окна уже классифицированы при интернировании,
+        # поэтому проверка сводится к счётчику помеченных сигналов в окне.
+        return self.fact_index.flagged_in_window > 0
\ No newline at end of file
@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: GPL-3.0-only
+"""
+Индекс онтических фактов (ontic_facts) в скользящем окне сигналов.
+Предикаты и объекты интернируются в целочисленные id; обратные индексы
+(предикат → сигналы, объект → сигналы) позволяют выполнять запросы
+и high-stakes-классификацию как операции над множествами целых чисел.
+Прочие строковые признаки сигнала (например, intent) интернируются в том же
+пространстве id как термы: они участвуют в классификации, но не в индексах фактов.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_WINDOW = 64
+
+# signal_id, факты (predicate_id, object_id), id термов, признак high-stakes
+_Record = Tuple[str, Tuple[Tuple[int, int], ...], Tuple[int, ...], bool]
+
+
+class OnticFactIndex:
+    """
+    Хранилище фактов одного профиля. Не хранит сигналы целиком —
+    только signal_id и интернированные пары (predicate, object).
+    Сигналы, вышедшие за пределы окна, удаляются из всех индексов.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, flag_terms: Iterable[str] = ()):
+        if window < 1:
+            raise ValueError("Window must be a positive integer")
+        self.window = window
+        self._flag_terms = tuple(term.lower() for term in flag_terms)
+
+        # Интернирование: строка ↔ id, со счётчиком ссылок из окна
+        self._ids: Dict[str, int] = {}
+        self._strings: Dict[int, str] = {}
+        self._refs: Dict[int, int] = {}
+        self._next_id = 0
+        self._flagged_ids: Set[int] = set()
+
+        # Обратные индексы: id → порядковые номера сигналов (seq)
+        self._by_predicate: Dict[int, Set[int]] = {}
+        self._by_object: Dict[int, Set[int]] = {}
+
+        # Окно: seq в порядке поступления; seq → (signal_id, факты, термы, признак high-stakes)
+        self._window: Deque[int] = deque()
+        self._records: Dict[int, _Record] = {}
+        self._flagged_in_window = 0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def add(self, signal: Dict[str, Any], terms: Iterable[str] = ()) -> int:
+        """
+        Индексирует ontic_facts сигнала. Возвращает порядковый номер (seq).
+        Некорректные факты (не dict или без строковых predicate/object) пропускаются.
+        :param terms: дополнительные строковые признаки сигнала для классификации по flag_terms
+        """
+        seq = self._seq
+        self._seq += 1
+        signal_id = signal.get("signal_id") or f"seq:{seq}"
+
+        facts = []
+        for fact in signal.get("ontic_facts") or ():
+            if not isinstance(fact, dict):
+                continue
+            predicate, obj = fact.get("predicate"), fact.get("object")
+            if not isinstance(predicate, str) or not isinstance(obj, str):
+                continue
+            pid, oid = self._intern(predicate), self._intern(obj)
+            self._by_predicate.setdefault(pid, set()).add(seq)
+            self._by_object.setdefault(oid, set()).add(seq)
+            facts.append((pid, oid))
+
+        term_ids = tuple(self._intern(term) for term in terms)
+        flagged = any(pid in self._flagged_ids or oid in self._flagged_ids for pid, oid in facts)
+        flagged = flagged or any(tid in self._flagged_ids for tid in term_ids)
+        self._window.append(seq)
+        self._records[seq] = (signal_id, tuple(facts), term_ids, flagged)
+        if flagged:
+            self._flagged_in_window += 1
+
+        while len(self._window) > self.window:
+            self._evict()
+        return seq
+
+    def signals_with_predicate(self, predicate: str) -> List[str]:
+        """Все сигналы окна, содержащие предикат (например, contraindicated_with)."""
+        return self._resolve(self._lookup(self._by_predicate, predicate))
+
+    def signals_with_object(self, obj: str) -> List[str]:
+        """Все сигналы окна, содержащие объект."""
+        return self._resolve(self._lookup(self._by_object, obj))
+
+    def signals_with_fact(self, predicate: str, obj: str) -> List[str]:
+        """Сигналы окна, содержащие и предикат, и объект (пересечение индексов)."""
+        return self._resolve(
+            self._lookup(self._by_predicate, predicate) & self._lookup(self._by_object, obj)
+        )
+
+    def related(self, seq: int) -> List[str]:
+        """Сигналы окна, разделяющие с сигналом seq хотя бы один объект факта."""
+        record = self._records.get(seq)
+        if record is None:
+            return []
+        seqs: Set[int] = set()
+        for _, oid in record[1]:
+            seqs |= self._by_object.get(oid, set())
+        seqs.discard(seq)
+        return self._resolve(seqs)
+
+    def is_flagged(self, seq: int) -> bool:
+        """Содержит ли сигнал с данным seq факт или терм, совпадающий с flag_terms."""
+        record = self._records.get(seq)
+        return record is not None and record[3]
+
+    @property
+    def flagged_in_window(self) -> int:
+        """Число сигналов окна с фактами, совпадающими с flag_terms."""
+        return self._flagged_in_window
+
+    def _intern(self, value: str) -> int:
+        ident = self._ids.get(value)
+        if ident is None:
+            ident = self._next_id
+            self._next_id += 1
+            self._ids[value] = ident
+            self._strings[ident] = value
+            self._refs[ident] = 0
+            # Подстрочный поиск выполняется один раз — при интернировании
+            lowered = value.lower()
+            if any(term in lowered for term in self._flag_terms):
+                self._flagged_ids.add(ident)
+        self._refs[ident] += 1
+        return ident
+
+    def _release(self, ident: int) -> None:
+        self._refs[ident] -= 1
+        if self._refs[ident] == 0:
+            del self._refs[ident]
+            del self._ids[self._strings.pop(ident)]
+            self._flagged_ids.discard(ident)
+
+    def _evict(self) -> None:
+        seq = self._window.popleft()
+        _, facts, term_ids, flagged = self._records.pop(seq)
+        if flagged:
+            self._flagged_in_window -= 1
+        for pid, oid in facts:
+            self._discard(self._by_predicate, pid, seq)
+            self._discard(self._by_object, oid, seq)
+            self._release(pid)
+            self._release(oid)
+        for tid in term_ids:
+            self._release(tid)
+
+    @staticmethod
+    def _discard(index: Dict[int, Set[int]], ident: int, seq: int) -> None:
+        seqs = index.get(ident)
+        if seqs is not None:
+            seqs.discard(seq)
+            if not seqs:
+                del index[ident]
+
+    def _lookup(self, index: Dict[int, Set[int]], value: str) -> Set[int]:
+        ident: Optional[int] = self._ids.get(value)
+        if ident is None:
+            return set()
+        return index.get(ident, set())
+
+    def _resolve(self, seqs: Set[int]) -> List[str]:
+        return [self._records[seq][0] for seq in sorted(seqs)]
@@ -7,25 +7,82 @@
 import json
 import jsonschema
 from pathlib import Path
+from typing import Any, Callable
+
+from ..utils import shared_cache, tracing
 
 
 class SignalValidator:
     _schema = None
+    _validator = None
 
     @classmethod
     def load_schema(cls):
+        # Схема, опубликованная супервизором, следует за generation общего кэша
+        shared = shared_cache.lookup_blob("signal_schema")
+        if shared is not None:
+            return shared
         if cls._schema is None:
             schema_path = Path(__file__).parent.parent.parent / "specs" / "signal-schema.json"
             with open(schema_path, "r", encoding="utf-8") as f:
                 cls._schema = json.load(f)
         return cls._schema
 
+    @classmethod
+    def validator(cls):
+        """
+        Валидатор jsonschema для текущей схемы. Схема проверяется и валидатор строится
+        один раз — заново только при смене схемы (нового поколения общего кэша).
+        """
+        schema = cls.load_schema()
+        if cls._validator is None or cls._validator.schema is not schema:
+            validator_class = jsonschema.validators.validator_for(schema)
+            validator_class.check_schema(schema)
+            cls._validator = validator_class(schema)
+        return cls._validator
+
     @classmethod
     def validate(cls, signal: dict) -> bool:
         """
         Проверяет сигнал на соответствие внешней схеме.
         Возвращает True, если валиден; иначе вызывает jsonschema.ValidationError.
         """
-        schema = cls.load_schema()
-        jsonschema.validate(instance=signal, schema=schema)
-        return True  # Явный успех; исключение = провал
\ No newline at end of file
+        with tracing.span("signal_validator.validate"):
+            cls.validator().validate(signal)
+        return True  # Явный успех; исключение = провал
+
+
+def validate_signal(signal: dict, schema: str = "signal-schema.json") -> bool:
+    """
+    Функциональная обёртка над SignalValidator для архитектурных модулей.
+    Возвращает False для структурно невалидного сигнала вместо исключения.
+    Поддерживается только схема signal-schema.json.
+    """
+    _check_schema_name(schema)
+    if not isinstance(signal, dict):
+        raise TypeError("Signal must be a dictionary")
+    try:
+        return SignalValidator.validate(signal)
+    except jsonschema.ValidationError:
+        return False
+
+
+def batch_validator(schema: str = "signal-schema.json") -> Callable[[Any], bool]:
+    """
+    Проверка всплеска сигналов: схема загружается и валидатор берётся один раз на пакет,
+    для каждого сигнала вызывается только is_valid. Контракт — как у validate_signal.
+    """
+    _check_schema_name(schema)
+    validator = SignalValidator.validator()
+
+    def is_valid(signal: dict) -> bool:
+        if not isinstance(signal, dict):
+            raise TypeError("Signal must be a dictionary")
+        return validator.is_valid(signal)
+
+    return is_valid
+
+
+def _check_schema_name(schema: str) -> None:
+    if Path(schema).name != "signal-schema.json":
+        raise ValueError(f"Unsupported signal schema: {schema}")
\ No newline at end of file
@@ -13,6 +13,7 @@ from src.architectures.onto_richness import OntoRichnessMode
 from src.architectures.behav_mod import BehavModMode
 from src.protocols.license_guard import enforce_gpl_environment
 from src.utils.hardware_probe import detect_execution_context
+from src.utils import tracing
 
 
 class Transponder:
@@ -22,6 +23,9 @@ class Transponder:
         with open(config_path, "r", encoding="utf-8") as f:
             self.config = yaml.safe_load(f)
 
+        # Выборочная трассировка сигнального пути (секция tracing, по умолчанию выключена)
+        tracing.configure_from_config(self.config.get("tracing") or {})
+
         self.profile = load_onto144_profile(self.config.get("profile_uri"))
         self.temperament = self.profile.get("temperament", "default")
 
@@ -45,5 +49,20 @@ class Transponder:
         возвращает onto16r-излучение.
         """
         # Передаём сигнал в режимную архитектуру
-        emission = self.mode.process_signal(raw_signal)
-        return emission  # Должен соответствовать onto16r-emission-schema.json
\ No newline at end of file
+        with tracing.span("transponder.route_signal"):
+            emission = self.mode.process_signal(raw_signal)
+        return emission  # Должен соответствовать onto16r-emission-schema.json
+
+    def route_batch(self, raw_signals: list) -> list:
+        """
+        Маршрутизирует пакет сигналов (всплеск событий за один тик).
+        Если архитектура поддерживает process_batch — пакет обрабатывается целиком,
+        иначе — последовательно через process. Порядок излучений совпадает с входным.
+        Семантика ошибок та же, что у последовательной обработки: состояние архитектуры
+        отражает все сигналы до сбойного, затем исключение пробрасывается.
+        """
+        with tracing.span("transponder.route_batch"):
+            process_batch = getattr(self.mode, "process_batch", None)
+            if process_batch is None:
+                return [self.mode.process(raw_signal) for raw_signal in raw_signals]
+            return process_batch(raw_signals)
\ No newline at end of file
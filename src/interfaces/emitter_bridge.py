@@ -2,34 +2,177 @@
 """
 Мост приёма onto16r-сигналов от внешнего эмиттера.
 Не хранит и не идентифицирует отправителя — работает только с ontologically valid emission.
+
+Перед криптографией конверт проходит дешёвую предварительную проверку (размер, уровень
+доверия, заголовок Fernet-токена, подпись). Отклонения классифицируются и подсчитываются.
+Конверт разбирается один раз: декодированные токен и соль передаются на расшифровку.
+
+Отделённая подпись — HMAC-SHA256 на секрете, общем для эмиттера и моста. Проверка формы
+сама по себе не защищает от подделки: структурно корректный конверт со случайным токеном
+дойдёт до PBKDF2 (~20 мс). Поэтому мост с настроенным секретом по умолчанию требует
+подпись у каждого пакета (require_signature), и только пакеты эмиттера, знающего секрет,
+расходуют PBKDF2 и Fernet.
 """
 
+import base64
+import binascii
 import json
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
 from ..protocols.vma_signer import VMASigner
-from ..utils.crypto_utils import decrypt_onto16r
+from ..utils import tracing
+from ..utils.crypto_utils import decrypt_onto16r_token
+
+DEFAULT_MAX_PAYLOAD_BYTES = 64 * 1024
+
+# Уровни доверия пакетов (crypto_utils) по возрастанию строгости
+PACKAGE_TRUST_LEVELS = ("low", "medium", "high", "vma")
+# Минимальный уровень пакета для уровня доверия моста (0 = none, 3 = high)
+MIN_PACKAGE_TRUST = {0: "low", 1: "low", 2: "medium", 3: "high"}
+
+# Fernet: версия (1) + timestamp (8) + IV (16) + шифртекст (k * 16) + HMAC (32)
+_FERNET_VERSION = 0x80
+_FERNET_OVERHEAD = 1 + 8 + 16 + 32
+_FERNET_MAX_CLOCK_SKEW = 60
+_SALT_LEN = 16
+
+# Классы отклонений
+OVERSIZED = "oversized"
+MALFORMED = "malformed"
+TRUST_MISMATCH = "trust_mismatch"
+EXPIRED = "expired"
+MISSING_SIGNATURE = "missing_signature"
+INVALID_SIGNATURE = "invalid_signature"
+DECRYPT_FAILED = "decrypt_failed"
+
+# Разобранный конверт: Fernet-токен, соль, уровень доверия пакета
+_Envelope = Tuple[bytes, bytes, str]
 
 
 class EmitterBridge:
-    def __init__(self, trust_level: int = 1):
+    def __init__(
+        self,
+        trust_level: int = 1,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+        token_ttl: Optional[int] = None,
+        emitter_secret: Optional[bytes] = None,
+        require_signature: Optional[bool] = None,
+    ):
+        """
+        :param max_payload_bytes: верхняя граница размера конверта
+        :param token_ttl: максимальный возраст Fernet-токена в секундах (None — не проверять)
+        :param emitter_secret: общий с эмиттером секрет отделённых подписей
+                               (без него подписанные пакеты отклоняются как invalid_signature)
+        :param require_signature: требовать подпись у каждого пакета до криптографии;
+                                  по умолчанию включено, если задан emitter_secret
+        """
+        if require_signature is None:
+            require_signature = bool(emitter_secret)
+        if require_signature and not emitter_secret:
+            raise ValueError("require_signature needs an emitter secret")
         self.trust_level = trust_level
-        self.vma_signer = VMASigner()
+        self.require_signature = require_signature
+        self.max_payload_bytes = max_payload_bytes
+        self.token_ttl = token_ttl
+        self.vma_signer = VMASigner(payload_secret=emitter_secret)
+        self.rejections: Counter = Counter()
+        self._rejections_lock = threading.Lock()
+        min_trust = MIN_PACKAGE_TRUST.get(trust_level, "high")
+        self._accepted_trust = frozenset(
+            PACKAGE_TRUST_LEVELS[PACKAGE_TRUST_LEVELS.index(min_trust) :]
+        )
 
-    def receive_onto16r(self, encrypted_payload: bytes, signature: str = None) -> Optional[Dict[str, Any]]:
+    def receive_onto16r(
+        self, encrypted_payload: bytes, signature: str = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Принимает зашифрованный onto16r-сигнал от эмиттера.
         Валидирует подпись VMA (если в high-stakes контексте).
         Расшифровывает в соответствии с уровнем доверия.
         """
-        # При высоком уровне доверия или high-stakes — требуется VMA-подпись
-        if self.trust_level >= 3 and signature:
-            if not self.vma_signer.verify_signature(encrypted_payload, signature):
-                return None  # Невалидная подпись — отклонить
+        with tracing.span("emitter_bridge.receive_onto16r", trust_level=self.trust_level) as span:
+            onto16r, reason = self._receive(encrypted_payload, signature)
+            if reason is not None:
+                with self._rejections_lock:
+                    self.rejections[reason] += 1
+            span.set(accepted=onto16r is not None, rejection=reason)
+            return onto16r
+
+    def rejection_counts(self) -> Dict[str, int]:
+        """Снимок счётчиков отклонений по классам."""
+        with self._rejections_lock:
+            return dict(self.rejections)
+
+    def prefilter(self, encrypted_payload: bytes, signature: str = None) -> Optional[str]:
+        """
+        Проверка конверта без криптографии.
+        Возвращает класс отклонения или None, если пакет допускается к расшифровке.
+        """
+        return self._precheck(encrypted_payload, signature)[0]
+
+    def _precheck(
+        self, encrypted_payload: bytes, signature: str = None
+    ) -> Tuple[Optional[str], Optional[_Envelope]]:
+        # Возвращает (класс отклонения, None) или (None, разобранный конверт)
+        if not isinstance(encrypted_payload, (bytes, bytearray)):
+            return MALFORMED, None
+        if len(encrypted_payload) > self.max_payload_bytes:
+            return OVERSIZED, None
+
+        try:
+            # Конверт — JSON-пакет из crypto_utils.encrypt_onto16r
+            package = json.loads(encrypted_payload)
+        except ValueError:
+            return MALFORMED, None
+        if not isinstance(package, dict):
+            return MALFORMED, None
+        ciphertext, salt = package.get("ciphertext"), package.get("salt")
+        trust = package.get("trust_level")
+        if not all(isinstance(v, str) for v in (ciphertext, salt, trust)):
+            return MALFORMED, None
+
+        if trust not in self._accepted_trust:
+            return TRUST_MISMATCH, None
 
         try:
-            decrypted = decrypt_onto16r(encrypted_payload, trust_level=self.trust_level)
+            salt_bytes = base64.b64decode(salt, validate=True)
+            token = base64.b64decode(ciphertext, validate=True)
+            raw = base64.urlsafe_b64decode(token)
+        except (binascii.Error, ValueError):
+            return MALFORMED, None
+        if (
+            len(salt_bytes) != _SALT_LEN
+            or len(raw) < _FERNET_OVERHEAD + 16
+            or (len(raw) - _FERNET_OVERHEAD) % 16
+            or raw[0] != _FERNET_VERSION
+        ):
+            return MALFORMED, None
+
+        if self.token_ttl is not None:
+            issued = int.from_bytes(raw[1:9], "big")
+            now = int(time.time())
+            if issued + self.token_ttl < now or issued > now + _FERNET_MAX_CLOCK_SKEW:
+                return EXPIRED, None
+
+        # Подпись обязательна для моста с require_signature, высокого доверия или high-stakes
+        if self.require_signature or self.trust_level >= 3 or trust == "vma":
+            if not signature:
+                return MISSING_SIGNATURE, None
+        if signature and not self.vma_signer.verify_signature(encrypted_payload, signature):
+            return INVALID_SIGNATURE, None
+        return None, (token, salt_bytes, trust)
+
+    def _receive(self, encrypted_payload: bytes, signature: str = None):
+        reason, envelope = self._precheck(encrypted_payload, signature)
+        if reason is not None:
+            return None, reason
+
+        try:
+            decrypted = decrypt_onto16r_token(*envelope)
             onto16r = json.loads(decrypted)
             # Онтологическая валидация происходит далее в signal_validator.py
-            return onto16r
+            return onto16r, None
         except Exception:
-            return None
\ No newline at end of file
+            return None, DECRYPT_FAILED
@@ -0,0 +1,483 @@
+# SPDX-License-Identifier: GPL-3.0-only
+"""
+Локальный эмиттер и генератор нагрузки для сквозного тестирования пропускной способности.
+Производит настоящие зашифрованные onto16r-пакеты (crypto_utils.encrypt_onto16r),
+при необходимости подписанные VMA, и передаёт их в EmitterBridge через UNIX-сокет
+или канал (socketpair) в отдельном процессе.
+
+Режимы нагрузки:
+- open  — открытый цикл: отправка по расписанию с заданной частотой, независимо от ответов.
+          Задержка отсчитывается от запланированного момента отправки (без coordinated omission).
+- closed — закрытый цикл: N соединений, каждое отправляет следующий пакет после ответа.
+          При заданном expected_interval задержки корректируются так же, как в HdrHistogram.
+
+Запуск: python -m src.interfaces.local_emitter --mode open --rate 200 --duration 10
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..protocols.vma_signer import VMASigner
+from ..utils.crypto_utils import encrypt_onto16r
+from .emitter_bridge import EmitterBridge
+
+# Заголовок кадра: длина payload, длина подписи (0 = подписи нет)
+FRAME_HEADER = struct.Struct(">II")
+ACK_ACCEPTED = b"\x01"
+ACK_REJECTED = b"\x00"
+
+# Переменная окружения с общим секретом отделённых подписей эмиттера и моста
+SECRET_ENV = "ONTO_EMITTER_SECRET"
+
+# Шаблоны сигналов по signal_protocol.md: класс → (сигнал, уровень доверия шифрования)
+SIGNAL_TEMPLATES: Dict[str, Tuple[Dict[str, Any], str]] = {
+    "gaming": (
+        {
+            "source": "onto-emitter/gaming/v2",
+            "context_class": "player_action",
+            "ontic_facts": [
+                {"predicate": "performed_action", "object": "cast_spell_fireball"},
+                {"predicate": "within_zone", "object": "arena_north"},
+            ],
+            "stakes_level": "low",
+        },
+        "low",
+    ),
+    "social": (
+        {
+            "source": "onto-emitter/social/v1",
+            "context_class": "social_interaction",
+            "ontic_facts": [
+                {"predicate": "requests", "object": "consent_share_presence"},
+            ],
+            "stakes_level": "medium",
+        },
+        "medium",
+    ),
+    "medical": (
+        {
+            "source": "onto-emitter/clinical/v1",
+            "context_class": "treatment_recommendation",
+            "ontic_facts": [
+                {"predicate": "recommends_procedure", "object": "emergency_splenectomy"},
+                {"predicate": "contraindicated_with", "object": "allergy_penicillin"},
+            ],
+            "stakes_level": "high",
+        },
+        "vma",
+    ),
+}
+
+DEFAULT_MIX = {"gaming": 0.8, "social": 0.15, "medical": 0.05}
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+Payload = Tuple[bytes, Optional[str]]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Разбирает строку вида 'gaming=0.8,medical=0.2' в словарь весов."""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SIGNAL_TEMPLATES:
+            raise ValueError(f"Unknown signal class in mix: {name}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def build_payloads(
+    mix: Optional[Dict[str, float]] = None,
+    pool_size: int = 32,
+    sign: str = "auto",
+    seed: Optional[int] = None,
+    secret: Optional[bytes] = None,
+) -> List[Payload]:
+    """
+    Заранее формирует пул зашифрованных пакетов (PBKDF2 слишком дорог для генерации на лету).
+    :param sign: VMA-подпись внутри сигнала: 'auto' — для stakes_level = high; 'always'; 'never'.
+    :param secret: общий с EmitterBridge секрет; если задан, каждый пакет получает отделённую
+                   подпись (мост с секретом по умолчанию требует её у всех пакетов)
+    :return: список (payload, signature) для передачи в EmitterBridge.receive_onto16r
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    payloads = []
+    for i, name in enumerate(rng.choices(names, weights=weights, k=pool_size)):
+        template, trust_level = SIGNAL_TEMPLATES[name]
+        signal = dict(template)
+        signal["signal_id"] = f"urn:onto:sig:load:{i:06d}"
+        signal["timestamp"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        signed = sign == "always" or (sign == "auto" and signal["stakes_level"] == "high")
+        signer = VMASigner(vma_context=name, payload_secret=secret)
+        if signed:
+            signal = signer.sign(signal, phase_id=f"load-{name}")
+        package = encrypt_onto16r(json.dumps(signal, ensure_ascii=False), trust_level)
+        payload = json.dumps(package).encode("utf-8")
+        payloads.append((payload, signer.sign_payload(payload) if secret else None))
+    return payloads
+
+
+def write_frame(sock: socket.socket, payload: bytes, signature: Optional[str] = None) -> None:
+    sig_bytes = signature.encode("utf-8") if signature else b""
+    sock.sendall(FRAME_HEADER.pack(len(payload), len(sig_bytes)) + payload + sig_bytes)
+
+
+def read_frame(sock: socket.socket) -> Optional[Payload]:
+    """Читает кадр; возвращает None при закрытии соединения."""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    payload_len, sig_len = FRAME_HEADER.unpack(header)
+    payload = _recv_exact(sock, payload_len)
+    signature = _recv_exact(sock, sig_len) if sig_len else b""
+    if payload is None or signature is None:
+        return None
+    return payload, signature.decode("utf-8") or None
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def serve_connection(conn: socket.socket, bridge: EmitterBridge) -> None:
+    """Принимает кадры, передаёт их в EmitterBridge и отвечает байтом подтверждения."""
+    with conn:
+        while True:
+            frame = read_frame(conn)
+            if frame is None:
+                return
+            payload, signature = frame
+            result = bridge.receive_onto16r(payload, signature)
+            conn.sendall(ACK_ACCEPTED if result is not None else ACK_REJECTED)
+
+
+def _serve_unix(
+    path: str, connections: int, trust_level: int, secret: Optional[bytes], ready
+) -> None:
+    bridge = EmitterBridge(trust_level=trust_level, emitter_secret=secret)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(connections)
+    ready.set()
+    workers = []
+    with server:
+        for _ in range(connections):
+            conn, _ = server.accept()
+            worker = threading.Thread(target=serve_connection, args=(conn, bridge), daemon=True)
+            worker.start()
+            workers.append(worker)
+    for worker in workers:
+        worker.join()
+
+
+def _serve_pipes(
+    conns: List[socket.socket],
+    peers: List[socket.socket],
+    trust_level: int,
+    secret: Optional[bytes],
+) -> None:
+    # Клиентские концы, унаследованные процессом, закрываются — иначе EOF не наступит
+    for peer in peers:
+        peer.close()
+    bridge = EmitterBridge(trust_level=trust_level, emitter_secret=secret)
+    workers = [
+        threading.Thread(target=serve_connection, args=(conn, bridge), daemon=True)
+        for conn in conns
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+class BridgeProcess:
+    """
+    Запускает EmitterBridge в отдельном процессе и выдаёт клиентские соединения.
+    transport: 'unix' (UNIX-сокет по пути path) или 'pipe' (socketpair).
+    secret — общий секрет отделённых подписей (тот же, что в build_payloads).
+    """
+
+    def __init__(
+        self,
+        transport: str = "unix",
+        connections: int = 1,
+        trust_level: int = 1,
+        path: Optional[str] = None,
+        secret: Optional[bytes] = None,
+    ):
+        if transport not in ("unix", "pipe"):
+            raise ValueError(f"Unsupported transport: {transport}")
+        self.transport = transport
+        self.connections = connections
+        self.trust_level = trust_level
+        self.path = path
+        self.secret = secret
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._clients: List[socket.socket] = []
+
+    def __enter__(self) -> List[socket.socket]:
+        if self.transport == "pipe":
+            pairs = [socket.socketpair() for _ in range(self.connections)]
+            self._process = multiprocessing.Process(
+                target=_serve_pipes,
+                args=(
+                    [srv for _, srv in pairs],
+                    [cli for cli, _ in pairs],
+                    self.trust_level,
+                    self.secret,
+                ),
+                daemon=True,
+            )
+            self._process.start()
+            for client, srv in pairs:
+                srv.close()
+                self._clients.append(client)
+            return self._clients
+
+        if self.path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="onto-emitter-")
+            self.path = os.path.join(self._tmpdir.name, "bridge.sock")
+        ready = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_serve_unix,
+            args=(self.path, self.connections, self.trust_level, self.secret, ready),
+            daemon=True,
+        )
+        self._process.start()
+        if not ready.wait(timeout=10):
+            raise RuntimeError("EmitterBridge process did not start")
+        for _ in range(self.connections):
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(self.path)
+            self._clients.append(client)
+        return self._clients
+
+    def __exit__(self, *exc_info) -> None:
+        for client in self._clients:
+            client.close()
+        if self._process is not None:
+            self._process.join(timeout=10)
+            if self._process.is_alive():
+                self._process.terminate()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+
+def run_open_loop(
+    conn: socket.socket, payloads: List[Payload], rate: float, duration: float
+) -> Dict[str, Any]:
+    """
+    Открытый цикл: пакет i отправляется в момент start + i / rate.
+    Задержка измеряется от запланированного момента, а не от фактической отправки,
+    поэтому отставание отправителя не скрывает очередь (coordinated omission).
+    Ошибка отправителя (например, разрыв канала) завершает приём и пробрасывается.
+    """
+    if rate <= 0 or duration <= 0:
+        raise ValueError("Rate and duration must be positive")
+    total = max(int(rate * duration), 1)
+    interval = 1.0 / rate
+    scheduled: deque = deque()
+    failures: List[Exception] = []
+    start = time.perf_counter()
+
+    def sender() -> None:
+        try:
+            for i in range(total):
+                intended = start + i * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                payload, signature = payloads[i % len(payloads)]
+                scheduled.append(intended)
+                write_frame(conn, payload, signature)
+        except Exception as exc:
+            failures.append(exc)
+            # Подтверждения больше не придут: закрытие сокета прерывает ожидание приёмника
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=sender, daemon=True)
+    thread.start()
+
+    latencies = []
+    accepted = 0
+    for _ in range(total):
+        ack = _recv_exact(conn, 1)
+        if ack is None:
+            break
+        latencies.append(time.perf_counter() - scheduled.popleft())
+        accepted += ack == ACK_ACCEPTED
+    thread.join()
+    if failures:
+        raise failures[0]
+    return summarize(latencies, len(latencies), accepted, time.perf_counter() - start, "open")
+
+
+def run_closed_loop(
+    conns: List[socket.socket],
+    payloads: List[Payload],
+    duration: float,
+    expected_interval: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Закрытый цикл: каждое соединение отправляет следующий пакет после ответа.
+    Если задан expected_interval, задержки, превышающие его, дополняются
+    синтетическими отсчётами (как HdrHistogram.recordValueWithExpectedInterval).
+    """
+    if not conns or duration <= 0:
+        raise ValueError("Closed loop needs at least one connection and a positive duration")
+    latencies: List[float] = []
+    counters = {"responses": 0, "accepted": 0}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker(index: int, conn: socket.socket) -> None:
+        local, responses, accepted = [], 0, 0
+        i = index
+        while time.perf_counter() < deadline:
+            payload, signature = payloads[i % len(payloads)]
+            i += len(conns)
+            sent = time.perf_counter()
+            write_frame(conn, payload, signature)
+            ack = _recv_exact(conn, 1)
+            if ack is None:
+                break
+            _record(local, time.perf_counter() - sent, expected_interval)
+            responses += 1
+            accepted += ack == ACK_ACCEPTED
+        with lock:
+            latencies.extend(local)
+            counters["responses"] += responses
+            counters["accepted"] += accepted
+
+    threads = [threading.Thread(target=worker, args=(i, c)) for i, c in enumerate(conns)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, counters["responses"], counters["accepted"], elapsed, "closed")
+
+
+def _record(latencies: List[float], value: float, expected_interval: Optional[float]) -> None:
+    latencies.append(value)
+    if expected_interval:
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            latencies.append(missing)
+            missing -= expected_interval
+
+
+def summarize(
+    latencies: List[float], responses: int, accepted: int, elapsed: float, mode: str
+) -> Dict[str, Any]:
+    """
+    Сводка: число ответов, принятые/отклонённые, достигнутая частота и перцентили (мс).
+    samples может превышать responses за счёт корректирующих отсчётов закрытого цикла.
+    """
+    ordered = sorted(latencies)
+    report: Dict[str, Any] = {
+        "mode": mode,
+        "responses": responses,
+        "accepted": accepted,
+        "rejected": responses - accepted,
+        "samples": len(ordered),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(responses / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    if not ordered:
+        return report
+    for pct in PERCENTILES:
+        rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+        report[f"p{pct:g}_ms"] = round(ordered[rank] * 1000, 3)
+    report["max_ms"] = round(ordered[-1] * 1000, 3)
+    return report
+
+
+def _positive(cast):
+    def parse(value: str):
+        number = cast(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive: {value}")
+        return number
+
+    return parse
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local onto16r emitter and load generator")
+    parser.add_argument("--mode", choices=("open", "closed"), default="open")
+    parser.add_argument("--transport", choices=("unix", "pipe"), default="unix")
+    parser.add_argument("--socket", dest="path", help="UNIX socket path (default: temporary)")
+    parser.add_argument(
+        "--rate", type=_positive(float), default=100.0, help="open loop: signals per second"
+    )
+    parser.add_argument(
+        "--concurrency", type=_positive(int), default=1, help="closed loop: connections"
+    )
+    parser.add_argument(
+        "--expected-interval-ms", type=_positive(float), help="closed loop: CO correction"
+    )
+    parser.add_argument("--duration", type=_positive(float), default=10.0, help="seconds")
+    parser.add_argument("--mix", default=None, help="e.g. gaming=0.8,medical=0.2")
+    parser.add_argument("--sign", choices=("auto", "always", "never"), default="auto")
+    parser.add_argument("--pool-size", type=_positive(int), default=32)
+    parser.add_argument("--trust-level", type=int, default=1, help="EmitterBridge trust level")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--secret",
+        default=os.environ.get(SECRET_ENV),
+        help=f"shared signature secret (default: ${SECRET_ENV} or random per run)",
+    )
+    args = parser.parse_args(argv)
+
+    secret = args.secret.encode("utf-8") if args.secret else os.urandom(32)
+    mix = parse_mix(args.mix) if args.mix else None
+    payloads = build_payloads(
+        mix, pool_size=args.pool_size, sign=args.sign, seed=args.seed, secret=secret
+    )
+    connections = args.concurrency if args.mode == "closed" else 1
+
+    bridge = BridgeProcess(args.transport, connections, args.trust_level, args.path, secret)
+    with bridge as conns:
+        if args.mode == "open":
+            report = run_open_loop(conns[0], payloads, args.rate, args.duration)
+        else:
+            interval = args.expected_interval_ms / 1000.0 if args.expected_interval_ms else None
+            report = run_closed_loop(conns, payloads, args.duration, interval)
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,8 @@ import yaml
 from pathlib import Path
 from typing import Dict, Literal, Optional
 
+from ..utils import shared_cache
+
 
 class Onto144Connector:
     def __init__(self, profile_path: str = None):
@@ -39,9 +41,11 @@ class Onto144Connector:
         if not temperament:
             return None
 
-        # Привязка через config/temperament_bindings.yaml
-        bindings_path = Path(__file__).parent.parent / "config" / "temperament_bindings.yaml"
-        with open(bindings_path, "r", encoding="utf-8") as f:
-            bindings = yaml.safe_load(f)
+        # Привязка через config/temperament_bindings.yaml (или из общего кэша супервизора)
+        bindings = shared_cache.lookup_blob("temperament_bindings")
+        if bindings is None:
+            bindings_path = Path(__file__).parent.parent / "config" / "temperament_bindings.yaml"
+            with open(bindings_path, "r", encoding="utf-8") as f:
+                bindings = yaml.safe_load(f)
 
         return bindings.get(temperament)
\ No newline at end of file
@@ -19,17 +19,23 @@ VMA Signer: этическая подпись сигналов в high-stakes к
 """
 
 import hashlib
+import hmac
 import json
 from typing import Any, Dict, Optional
 
+from ..utils import tracing
+
 class VMASigner:
     """
     Подписывает входящие сигналы в контекстах с высокими этическими ставками
     (медицина, финансы, право). Подпись не содержит биометрических данных,
     только онтологический хэш и ссылку на фазу валидации.
+    Отделённые подписи пакетов (sign_payload) — HMAC-SHA256 на общем секрете
+    эмиттера и моста; без секрета подписать пакет нельзя, а проверка всегда неуспешна.
     """
-    def __init__(self, vma_context: str = "default"):
+    def __init__(self, vma_context: str = "default", payload_secret: Optional[bytes] = None):
         self.vma_context = vma_context  # e.g. "medical", "legal", "gaming"
+        self._payload_secret = payload_secret or None
 
     def sign(self, signal: Dict[str, Any], phase_id: str) -> Dict[str, Any]:
         """
@@ -41,6 +47,10 @@ class VMASigner:
         if not isinstance(signal, dict):
             raise ValueError("Signal must be a dictionary")
 
+        with tracing.span("vma_signer.sign", vma_context=self.vma_context):
+            return self._sign(signal, phase_id)
+
+    def _sign(self, signal: Dict[str, Any], phase_id: str) -> Dict[str, Any]:
         # Строим каноническое представление сигнала без подписи
         payload = {
             "signal": signal,
@@ -88,4 +98,36 @@ class VMASigner:
         canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
         actual_hash = hashlib.sha3_256(canonical.encode('utf-8')).hexdigest()
 
-        return actual_hash == expected_hash
\ No newline at end of file
+        return actual_hash == expected_hash
+
+    def sign_payload(self, payload: bytes) -> str:
+        """
+        Отделённая подпись зашифрованного onto16r-пакета: HMAC-SHA256 на общем секрете.
+        Позволяет EmitterBridge проверить подпись до расшифровки.
+        """
+        if self._payload_secret is None:
+            raise ValueError("Payload signatures require a shared secret")
+        return hmac.new(self._payload_secret, payload, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, payload: bytes, signature: str) -> bool:
+        """Проверяет отделённую подпись пакета (см. sign_payload)."""
+        if self._payload_secret is None:
+            return False
+        if not isinstance(signature, str) or not signature.isascii():
+            return False
+        return hmac.compare_digest(self.sign_payload(payload), signature)
+
+
+def sign_with_vma_if_needed(
+    signal: Dict[str, Any],
+    profile: Optional[Dict[str, Any]] = None,
+    phase_id: str = "noema-emission",
+) -> Dict[str, Any]:
+    """
+    Подписывает излучение архитектуры, если оно ещё не подписано.
+    Контекст VMA берётся из профиля (vma_context), по умолчанию — "default".
+    """
+    if "vma_signature" in signal:
+        return signal
+    context = (profile or {}).get("vma_context", "default")
+    return VMASigner(vma_context=context).sign(signal, phase_id=phase_id)
\ No newline at end of file
@@ -9,6 +9,8 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 import os
 
+from . import tracing
+
 def derive_key_from_context(context_trust_level: str, salt: bytes = None) -> tuple[bytes, bytes]:
     """
     Генерирует ключ на основе уровня доверия контекста.
@@ -24,13 +26,14 @@ def derive_key_from_context(context_trust_level: str, salt: bytes = None) -> tup
         'vma': b"ethically_audited_space"
     }.get(context_trust_level, b"unknown_trust")
 
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=100000,
-    )
-    key = base64.urlsafe_b64encode(kdf.derive(trust_seed))
+    with tracing.span("crypto_utils.derive_key", trust_level=context_trust_level):
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=100000,
+        )
+        key = base64.urlsafe_b64encode(kdf.derive(trust_seed))
     return key, salt
 
 def encrypt_onto16r(onto16r_payload: str, context_trust_level: str) -> dict:
@@ -38,9 +41,10 @@ def encrypt_onto16r(onto16r_payload: str, context_trust_level: str) -> dict:
     Шифрует onto16r-излучение с ключом, привязанным к уровню доверия.
     Возвращает: { 'ciphertext': ..., 'salt': ..., 'trust_level': ... }
     """
-    key, salt = derive_key_from_context(context_trust_level)
-    f = Fernet(key)
-    ciphertext = f.encrypt(onto16r_payload.encode('utf-8'))
+    with tracing.span("crypto_utils.encrypt_onto16r", trust_level=context_trust_level):
+        key, salt = derive_key_from_context(context_trust_level)
+        f = Fernet(key)
+        ciphertext = f.encrypt(onto16r_payload.encode('utf-8'))
     return {
         "ciphertext": base64.b64encode(ciphertext).decode('ascii'),
         "salt": base64.b64encode(salt).decode('ascii'),
@@ -51,8 +55,18 @@ def decrypt_onto16r(encrypted_package: dict) -> str:
     """
     Расшифровывает onto16r-излучение.
     """
-    salt = base64.b64decode(encrypted_package["salt"])
-    key, _ = derive_key_from_context(encrypted_package["trust_level"], salt=salt)
-    f = Fernet(key)
-    ciphertext = base64.b64decode(encrypted_package["ciphertext"])
-    return f.decrypt(ciphertext).decode('utf-8')
\ No newline at end of file
+    return decrypt_onto16r_token(
+        base64.b64decode(encrypted_package["ciphertext"]),
+        base64.b64decode(encrypted_package["salt"]),
+        encrypted_package["trust_level"],
+    )
+
+def decrypt_onto16r_token(token: bytes, salt: bytes, context_trust_level: str) -> str:
+    """
+    Расшифровывает уже разобранный пакет: Fernet-токен и соль в байтах.
+    Используется EmitterBridge, который декодирует конверт при предварительной проверке.
+    """
+    with tracing.span("crypto_utils.decrypt_onto16r"):
+        key, _ = derive_key_from_context(context_trust_level, salt=salt)
+        f = Fernet(key)
+        return f.decrypt(token).decode('utf-8')
\ No newline at end of file
@@ -0,0 +1,266 @@
+# shared_cache.py
+# Общий сегмент разделяемой памяти для разобранных спецификаций между рабочими процессами.
+# Супервизор один раз читает JSON/YAML-файлы (YAML-разбор — самая дорогая часть прогрева)
+# и публикует их одним JSON-блоком; рабочие процессы отображают сегмент только для чтения
+# и разбирают блок один раз на поколение.
+#
+# Схема:
+# - управляющий сегмент "<prefix>-ctl": seqlock (seq, generation, имя сегмента данных);
+# - сегмент данных "<prefix>-g<generation>": заголовок и JSON-блок.
+# Обновление атомарно: новый сегмент данных публикуется целиком, затем меняется generation.
+# Рабочий процесс читает управляющий сегмент не чаще раза в poll_interval, а не на каждый
+# lookup_blob; зависший посреди записи супервизор не замедляет последующие вызовы.
+#
+# Экономится CPU разбора, но не память: каждый рабочий процесс копирует блок и держит
+# собственные разобранные dict. Объекты Python нельзя разделять между процессами без
+# копирования — интерпретатор пишет счётчики ссылок в каждый объект при обращении,
+# а в разделяемом сегменте живут только байты.
+#
+# Ключи PBKDF2 здесь не кэшируются: каждый пакет encrypt_onto16r несёт свежую случайную соль,
+# поэтому супервизор не может знать пары (уровень доверия, соль) заранее. Общий ключ
+# потребовал бы изменения протокола шифрования.
+
+import json
+import mmap
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+# Приватный модуль CPython (тот же, что использует multiprocessing.shared_memory);
+# shm_open проверен на CPython 3.10–3.13.
+try:
+    import _posixshmem
+except ImportError:  # Windows: сегменты не отслеживаются resource_tracker
+    _posixshmem = None
+
+DEFAULT_PREFIX = "onto-transponder"
+
+_NAME_LEN = 32
+_CONTROL = struct.Struct(f">QQ{_NAME_LEN}s")  # seq (нечётный = идёт запись), generation, имя
+_HEADER = struct.Struct(">8sQQ")  # magic, generation, длина JSON-блока
+_MAGIC = b"ONTOSHM2"
+# Запас под суффикс "-g<generation>" в имени сегмента данных
+_MAX_PREFIX_LEN = _NAME_LEN - len("-g") - 10
+
+# Повторы чтения seqlock, пока супервизор пишет управляющий сегмент. Если запись так и не
+# завершилась, сегмент считается зависшим: следующие проверки делают одну попытку без ожидания.
+_CONTROL_RETRIES = 100
+_CONTROL_BACKOFF = 0.001
+
+# Как часто рабочий процесс проверяет смену поколения (секунды)
+DEFAULT_POLL_INTERVAL = 1.0
+
+_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_SOURCES = {
+    "temperament_bindings": _ROOT / "config" / "temperament_bindings.yaml",
+    "signal_schema": _ROOT / "specs" / "signal-schema.json",
+}
+
+_reader = None  # SharedCacheReader текущего процесса (см. attach)
+
+
+class _ReadOnlySegment:
+    """
+    Отображение существующего сегмента только для чтения.
+    В отличие от SharedMemory(name=...), не регистрирует сегмент в resource_tracker,
+    который иначе удалил бы его при выходе рабочего процесса (до Python 3.13).
+    """
+
+    def __init__(self, name: str):
+        if _posixshmem is None:
+            self._shm: Optional[shared_memory.SharedMemory]
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._mmap = None
+            self.buf = self._shm.buf
+            return
+        self._shm = None
+        fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+        try:
+            self._mmap = mmap.mmap(fd, os.fstat(fd).st_size, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self.buf = memoryview(self._mmap)
+
+    def close(self) -> None:
+        self.buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._shm is not None:
+            self._shm.close()
+
+
+def _load_sources(sources: Dict[str, Path]) -> Dict[str, Any]:
+    blobs = {}
+    for name, path in sources.items():
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            blobs[name] = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+    return blobs
+
+
+class SharedCachePublisher:
+    """Сторона супервизора: создаёт управляющий сегмент и публикует поколения данных."""
+
+    def __init__(self, prefix: str = DEFAULT_PREFIX):
+        if not prefix.isascii() or len(prefix) > _MAX_PREFIX_LEN:
+            raise ValueError(
+                f"Shared cache prefix must be ASCII and at most {_MAX_PREFIX_LEN} characters"
+            )
+        self.prefix = prefix
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(
+            name=f"{prefix}-ctl", create=True, size=_CONTROL.size
+        )
+        _CONTROL.pack_into(self._control.buf, 0, 0, 0, b"")
+        self._segment: Optional[shared_memory.SharedMemory] = None
+
+    def publish(self, sources: Optional[Dict[str, Path]] = None) -> int:
+        """
+        Формирует новое поколение и атомарно переключает на него рабочие процессы.
+        :param sources: имя блока → путь к JSON/YAML (по умолчанию DEFAULT_SOURCES)
+        :return: номер опубликованного поколения
+        """
+        blob = json.dumps(
+            _load_sources(DEFAULT_SOURCES if sources is None else sources),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        generation = self.generation + 1
+        name = f"{self.prefix}-g{generation}"
+        if len(name) > _NAME_LEN:
+            raise ValueError(f"Shared cache segment name too long: {name}")
+        size = _HEADER.size + len(blob)
+        segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(segment.buf, 0, _MAGIC, generation, len(blob))
+        segment.buf[_HEADER.size : _HEADER.size + len(blob)] = blob
+
+        # Seqlock: нечётный seq сигнализирует читателям о незавершённой записи
+        seq = _CONTROL.unpack_from(self._control.buf, 0)[0]
+        struct.pack_into(">Q", self._control.buf, 0, seq + 1)
+        _CONTROL.pack_into(self._control.buf, 0, seq + 1, generation, name.encode("ascii"))
+        struct.pack_into(">Q", self._control.buf, 0, seq + 2)
+
+        # Уже подключённые процессы сохраняют отображение старого сегмента после unlink
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+        self._segment = segment
+        self.generation = generation
+        return generation
+
+    def close(self) -> None:
+        for shm in (self._segment, self._control):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._segment = None
+
+
+class SharedCacheReader:
+    """
+    Сторона рабочего процесса: отображает сегмент только для чтения и следит за generation.
+    JSON-блок копируется и разбирается один раз на поколение; смена поколения замечается
+    не позже чем через poll_interval секунд.
+    """
+
+    def __init__(
+        self,
+        prefix: str = DEFAULT_PREFIX,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._next_poll = 0.0
+        self._control_stuck = False
+        self._control = _ReadOnlySegment(f"{prefix}-ctl")
+        self._segment: Optional[_ReadOnlySegment] = None
+        self._blobs: Optional[Dict[str, Any]] = None
+
+    def get_blob(self, name: str) -> Optional[Any]:
+        if not self._refresh():
+            return None
+        if self._blobs is None:
+            _, _, blob_len = _HEADER.unpack_from(self._segment.buf, 0)
+            blob = bytes(self._segment.buf[_HEADER.size : _HEADER.size + blob_len])
+            self._blobs = json.loads(blob)
+        return self._blobs.get(name)
+
+    def close(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._control.close()
+
+    def _read_control(self) -> Optional[Tuple[int, str]]:
+        # Если супервизор завис посреди записи, читатель остаётся на текущем поколении
+        retries = 1 if self._control_stuck else _CONTROL_RETRIES
+        for attempt in range(retries):
+            seq, generation, name = _CONTROL.unpack_from(self._control.buf, 0)
+            if seq % 2 == 0 and struct.unpack_from(">Q", self._control.buf, 0)[0] == seq:
+                self._control_stuck = False
+                return generation, name.rstrip(b"\0").decode("ascii")
+            if attempt + 1 < retries:
+                time.sleep(_CONTROL_BACKOFF)
+        self._control_stuck = True
+        return None
+
+    def _refresh(self) -> bool:
+        now = time.monotonic()
+        if now < self._next_poll:
+            return self._segment is not None
+        self._next_poll = now + self.poll_interval
+        control = self._read_control()
+        if control is None:
+            return self._segment is not None
+        generation, name = control
+        if generation == self.generation:
+            return self._segment is not None
+        if generation == 0:
+            return False
+        try:
+            segment = _ReadOnlySegment(name)
+        except FileNotFoundError:
+            # Поколение сменилось между чтением seqlock и подключением — повторить позже
+            return self._segment is not None
+        magic, seg_generation, _ = _HEADER.unpack_from(segment.buf, 0)
+        if magic != _MAGIC or seg_generation != generation:
+            segment.close()
+            return self._segment is not None
+        if self._segment is not None:
+            self._segment.close()
+        self._segment, self._blobs = segment, None
+        self.generation = generation
+        return True
+
+
+def attach(
+    prefix: str = DEFAULT_PREFIX, poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> SharedCacheReader:
+    """Подключает текущий процесс к опубликованному кэшу (вызывается в рабочем процессе)."""
+    global _reader
+    detach()
+    _reader = SharedCacheReader(prefix, poll_interval)
+    return _reader
+
+
+def detach() -> None:
+    global _reader
+    if _reader is not None:
+        _reader.close()
+        _reader = None
+
+
+def lookup_blob(name: str) -> Optional[Any]:
+    """Разобранная спецификация из общего кэша или None."""
+    if _reader is None:
+        return None
+    return _reader.get_blob(name)
@@ -0,0 +1,368 @@
+# tracing.py
+# Выборочная трассировка сигнального пути и профилирование по запросу.
+# Путь: EmitterBridge.receive_onto16r → SignalValidator → process архитектуры → VMASigner.sign
+# → шифрование. При выключенной трассировке span() возвращает общий пустой контекст
+# (одна проверка глобальной переменной), поэтому горячий путь почти ничего не платит.
+#
+# Решение о выборке принимается в корневом спане; дочерние спаны наследуют его.
+# Спаны не содержат payload — только имена, длительности и служебные атрибуты.
+
+import cProfile
+import itertools
+import json
+import os
+import pstats
+import random
+import signal
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+_tracer: Optional["Tracer"] = None
+_window: Optional["ProfileWindow"] = None
+_active: ContextVar[Optional[Union["Span", "_UnsampledSpan"]]] = ContextVar(
+    "onto_transponder_span", default=None
+)
+_span_ids = itertools.count(1)
+
+
+class SpanSink(ABC):
+    """Интерфейс приёмника спанов. Реализации должны быть потокобезопасны."""
+
+    @abstractmethod
+    def export(self, span: Dict[str, Any]) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class RingBufferSink(SpanSink):
+    """Кольцевой буфер последних спанов в памяти."""
+
+    def __init__(self, capacity: int = 4096):
+        self._spans: deque = deque(maxlen=capacity)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        self._spans.append(span)
+
+    def spans(self) -> List[Dict[str, Any]]:
+        return list(self._spans)
+
+
+class FileSink(SpanSink):
+    """
+    Запись спанов в локальный NDJSON-файл (один спан на строку).
+    Файл построчно буферизован: каждый спан виден читателю сразу после export.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    def __init__(self, sink: SpanSink, sample_rate: float = 0.01):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Sample rate must be within [0, 1]")
+        self.sink = sink
+        self.sample_rate = sample_rate
+
+    def sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _UnsampledSpan:
+    """
+    Корень трассы, не попавшей в выборку: ничего не экспортирует, но становится активным,
+    чтобы дочерние спаны унаследовали решение и вернули _NOOP, а не бросали жребий заново.
+    """
+
+    __slots__ = ("_token",)
+    tracer = None
+
+    def __enter__(self) -> "_UnsampledSpan":
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        _active.reset(self._token)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "window",
+        "name",
+        "attrs",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "_start",
+        "_token",
+        "_profiler",
+    )
+
+    def __init__(self, tracer, name, attrs, parent=None, window=None):
+        self.tracer = tracer
+        self.window = window
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(8).hex()
+        self._profiler = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self._token = _active.set(self)
+        if self.window is not None:
+            self._profiler = self.window.enter()
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration_ns = time.perf_counter_ns() - self._start
+        if self.window is not None:
+            self.window.exit(self._profiler)
+        _active.reset(self._token)
+        if self.tracer is not None:
+            if exc_type is not None:
+                self.attrs["error"] = exc_type.__name__
+            self.tracer.sink.export(
+                {
+                    "trace_id": self.trace_id,
+                    "span_id": self.span_id,
+                    "parent_id": self.parent_id,
+                    "name": self.name,
+                    "start_ns": self.start_ns,
+                    "duration_ns": duration_ns,
+                    "attrs": self.attrs,
+                }
+            )
+        return False
+
+
+def span(name: str, **attrs: Any):
+    """
+    Контекст спана. Внутри выбранной трассы создаёт дочерний спан; вне трассы —
+    корневой (с решением о выборке). При выключенной трассировке — пустой контекст.
+    """
+    parent = _active.get()
+    if parent is not None:
+        return Span(parent.tracer, name, attrs, parent) if parent.tracer is not None else _NOOP
+    if _tracer is None and _window is None:
+        return _NOOP
+    tracer = _tracer if _tracer is not None and _tracer.sample() else None
+    if tracer is None and _window is None:
+        return _UnsampledSpan()
+    return Span(tracer, name, attrs, window=_window)
+
+
+def configure(sink: Optional[SpanSink] = None, sample_rate: float = 0.01) -> Tracer:
+    """Включает трассировку. По умолчанию спаны пишутся в кольцевой буфер в памяти."""
+    global _tracer
+    disable()
+    _tracer = Tracer(sink if sink is not None else RingBufferSink(), sample_rate)
+    return _tracer
+
+
+def configure_from_config(config: Dict[str, Any]) -> Optional[Tracer]:
+    """
+    Настройка из секции tracing конфигурации:
+    sample_rate (0 = выключено), sink: memory | file, path, capacity;
+    profile_signal (например, SIGUSR2), profile_duration, profile_dir — триггер окна
+    профилирования, устанавливается независимо от sample_rate.
+    """
+    profile_signal = config.get("profile_signal")
+    if profile_signal:
+        signum = getattr(signal, str(profile_signal), None)
+        if not isinstance(signum, signal.Signals):
+            raise ValueError(f"Unknown profile signal: {profile_signal}")
+        install_profile_trigger(
+            signum,
+            float(config.get("profile_duration", 30.0)),
+            str(config.get("profile_dir", ".")),
+        )
+
+    sample_rate = float(config.get("sample_rate", 0.0))
+    if sample_rate <= 0.0:
+        disable()
+        return None
+    if config.get("sink", "memory") == "file":
+        sink: SpanSink = FileSink(config.get("path", "traces.ndjson"))
+    else:
+        sink = RingBufferSink(int(config.get("capacity", 4096)))
+    return configure(sink, sample_rate)
+
+
+def disable() -> None:
+    global _tracer
+    if _tracer is not None:
+        _tracer.sink.close()
+        _tracer = None
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def current_profile_window() -> Optional["ProfileWindow"]:
+    return _window
+
+
+class ProfileWindow:
+    """
+    Окно профилирования фиксированной длительности: корневые спаны горячего пути
+    выполняются под cProfile (по профайлеру на поток), а на границах окна снимаются
+    снимки tracemalloc. По завершении в output_dir пишутся .pstats и сводка по памяти.
+    """
+
+    def __init__(
+        self,
+        duration: float,
+        output_dir: str = ".",
+        memory: bool = True,
+        top: int = 25,
+    ):
+        self.duration = duration
+        self.output_dir = Path(output_dir)
+        self.memory = memory
+        self.top = top
+        self.results: List[Path] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profilers: List[cProfile.Profile] = []
+        self._in_flight = set()
+        self._closed = False
+        self._finished = threading.Event()
+        self._started_tracemalloc = False
+        self._snapshot = None
+        self._timer: Optional[threading.Timer] = None
+        self.deadline = 0.0
+
+    def start(self) -> "ProfileWindow":
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._snapshot = tracemalloc.take_snapshot()
+        self.deadline = time.monotonic() + self.duration
+        self._timer = threading.Timer(self.duration, self.finish)
+        self._timer.daemon = True
+        self._timer.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def enter(self) -> Optional[cProfile.Profile]:
+        if self._closed:
+            return None
+        profiler = getattr(self._local, "profiler", None)
+        if profiler is None:
+            profiler = self._local.profiler = cProfile.Profile()
+            with self._lock:
+                self._profilers.append(profiler)
+        try:
+            profiler.enable()
+        except ValueError:
+            return None  # в потоке уже активен другой профайлер
+        with self._lock:
+            self._in_flight.add(profiler)
+        return profiler
+
+    def exit(self, profiler: Optional[cProfile.Profile]) -> None:
+        if profiler is not None:
+            profiler.disable()
+            with self._lock:
+                self._in_flight.discard(profiler)
+        if time.monotonic() >= self.deadline:
+            self.finish()
+
+    def finish(self) -> None:
+        global _window
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Профайлеры, занятые в других потоках в этот момент, не учитываются
+            profilers = [p for p in self._profilers if p not in self._in_flight]
+        if _window is self:
+            _window = None
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        if profilers:
+            path = self.output_dir / f"profile-{stamp}.pstats"
+            pstats.Stats(*profilers).dump_stats(str(path))
+            self.results.append(path)
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot()
+            path = self.output_dir / f"tracemalloc-{stamp}.txt"
+            with open(path, "w", encoding="utf-8") as f:
+                for stat in snapshot.compare_to(self._snapshot, "lineno")[: self.top]:
+                    f.write(f"{stat}\n")
+            self.results.append(path)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        self._finished.set()
+
+
+def start_profile_window(
+    duration: float = 30.0, output_dir: str = ".", memory: bool = True
+) -> ProfileWindow:
+    """Открывает окно профилирования без перезапуска процесса."""
+    global _window
+    if _window is not None:
+        return _window
+    _window = ProfileWindow(duration, output_dir, memory).start()
+    return _window
+
+
+def install_profile_trigger(signum: int, duration: float = 30.0, output_dir: str = ".") -> Any:
+    """
+    Открывает окно профилирования по сигналу ОС (например, kill -USR2 <pid>).
+    Вызывается из главного потока. Возвращает предыдущий обработчик сигнала.
+    """
+    return signal.signal(signum, lambda *_: start_profile_window(duration, output_dir))
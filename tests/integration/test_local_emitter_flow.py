@@ -0,0 +1,84 @@
+import json
+import socket
+import pytest
+from src.interfaces.emitter_bridge import EmitterBridge
+from src.interfaces.local_emitter import (
+    BridgeProcess,
+    build_payloads,
+    main,
+    parse_mix,
+    run_closed_loop,
+    run_open_loop,
+)
+
+SECRET = b"test-emitter-secret"
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    return build_payloads(parse_mix("gaming=1,medical=1"), pool_size=4, seed=7, secret=SECRET)
+
+
+def test_payloads_decrypt_through_bridge(payloads):
+    bridge = EmitterBridge(trust_level=1, emitter_secret=SECRET)
+    for payload, signature in payloads:
+        onto16r = bridge.receive_onto16r(payload, signature)
+        assert onto16r is not None
+        assert onto16r["signal_id"].startswith("urn:onto:sig:load:")
+        if onto16r["stakes_level"] == "high":
+            assert "vma_signature" in onto16r
+
+
+def test_open_loop_over_unix_socket(payloads):
+    with BridgeProcess("unix", connections=1, secret=SECRET) as conns:
+        report = run_open_loop(conns[0], payloads, rate=20, duration=0.25)
+    assert report["responses"] == 5
+    assert report["rejected"] == 0
+    assert report["p50_ms"] <= report["max_ms"]
+
+
+def test_closed_loop_over_pipe_with_correction(payloads):
+    with BridgeProcess("pipe", connections=2, secret=SECRET) as conns:
+        report = run_closed_loop(conns, payloads, duration=0.2, expected_interval=0.001)
+    assert report["responses"] > 0
+    assert report["accepted"] == report["responses"]
+    assert report["samples"] >= report["responses"]
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--rate", "0"],
+        ["--rate", "-5"],
+        ["--duration", "0"],
+        ["--mode", "closed", "--concurrency", "0"],
+    ],
+)
+def test_cli_rejects_non_positive_arguments(argv):
+    with pytest.raises(SystemExit):
+        main(argv)
+
+
+def test_signed_payloads_are_rejected_without_the_secret(payloads):
+    bridge = EmitterBridge(trust_level=1, emitter_secret=b"other-secret")
+    signed = [(payload, signature) for payload, signature in payloads if signature]
+    assert signed
+    for payload, signature in signed:
+        assert bridge.receive_onto16r(payload, signature) is None
+
+
+def test_open_loop_propagates_sender_failure():
+    client, server = socket.socketpair()
+    with client, server:
+        # Кадр нельзя сформировать: отправитель падает, приёмник не должен ждать вечно
+        with pytest.raises(TypeError):
+            run_open_loop(client, [("not bytes", None)], rate=10, duration=0.5)
+
+
+def test_open_loop_rejects_zero_rate(payloads):
+    with pytest.raises(ValueError):
+        run_open_loop(None, payloads, rate=0, duration=1)
+
+
+def test_garbage_payload_is_rejected():
+    assert EmitterBridge().receive_onto16r(json.dumps({"ciphertext": "x"}).encode()) is None
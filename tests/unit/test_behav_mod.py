@@ -0,0 +1,88 @@
+import random
+import pytest
+from src.architectures import behav_mod
+from src.architectures.behav_mod import BehavMod
+
+
+def _validate(signal, schema=None):
+    if not isinstance(signal, dict):
+        raise TypeError("Signal must be a dictionary")
+    return "intent" in signal
+
+
+@pytest.fixture(autouse=True)
+def accept_dict_signals(monkeypatch):
+    # specs/signal-schema.json не входит в дерево — проверяем только структуру сигнала
+    monkeypatch.setattr(behav_mod, "validate_signal", _validate)
+    monkeypatch.setattr(behav_mod, "batch_validator", lambda schema=None: _validate)
+
+
+def _burst(size, seed=0):
+    rng = random.Random(seed)
+    intents = ["query_map", "request_trade", "ping", "request_query", "emote_wave"]
+    proximities = ["close", "far", "neutral"]
+    return [
+        {"intent": rng.choice(intents), "social_proximity": rng.choice(proximities)}
+        for _ in range(size)
+    ]
+
+
+def _sequential(arch, signals):
+    emissions = []
+    for signal in signals:
+        emissions.append(arch.process(signal))
+    return emissions
+
+
+@pytest.mark.parametrize("size", [1, 3, 5, 6, 40])
+def test_batch_matches_sequential(size):
+    signals = _burst(size - 1)
+    signals.insert(size // 2, {"intent": "request_trade", "social_proximity": "close"})
+    sequential, batched = BehavMod({}), BehavMod({})
+
+    expected = _sequential(sequential, signals)
+    assert any("vma_signature" in emission for emission in expected)
+    assert batched.process_batch(signals) == expected
+    assert batched.context_short_memory == sequential.context_short_memory
+
+
+def test_consecutive_batches_match_sequential():
+    signals = _burst(23, seed=3)
+    sequential, batched = BehavMod({}), BehavMod({})
+
+    expected = _sequential(sequential, signals)
+    assert batched.process_batch(signals[:7]) + batched.process_batch(signals[7:]) == expected
+    assert batched.context_short_memory == sequential.context_short_memory
+
+
+def test_signed_entries_keep_unsigned_memory():
+    arch = BehavMod({})
+    [emission] = arch.process_batch([{"intent": "request_trade"}])
+    assert emission["intent_response"] == "commit_action"
+    assert "vma_signature" in emission
+    assert "vma_signature" not in arch.context_short_memory[0]
+
+
+@pytest.mark.parametrize(
+    "bad, error",
+    [
+        ({"intent": None}, TypeError),
+        ({"social_proximity": "close"}, ValueError),
+        ("junk", TypeError),
+    ],
+)
+def test_failure_mid_burst_matches_sequential(bad, error):
+    signals = [{"intent": "query"}, {"intent": "request"}, bad, {"intent": "ping"}]
+    sequential, batched = BehavMod({}), BehavMod({})
+
+    with pytest.raises(error):
+        _sequential(sequential, signals)
+    with pytest.raises(error):
+        batched.process_batch(signals)
+    assert batched.context_short_memory == sequential.context_short_memory
+    assert len(batched.context_short_memory) == 2
+
+
+def test_intent_cache_is_bounded():
+    BehavMod({}).process_batch({"intent": f"query_{i}"} for i in range(5000))
+    assert behav_mod._classify_intent.cache_info().currsize <= behav_mod.INTENT_CACHE_SIZE
@@ -0,0 +1,128 @@
+import base64
+import json
+import struct
+import time
+import pytest
+from src.interfaces import emitter_bridge
+from src.interfaces.emitter_bridge import EmitterBridge
+from src.protocols.vma_signer import VMASigner
+from src.utils.crypto_utils import encrypt_onto16r
+
+SECRET = b"test-emitter-secret"
+
+
+def _payload(trust_level="low", body='{"signal_id": "urn:onto:sig:test"}'):
+    return json.dumps(encrypt_onto16r(body, trust_level)).encode()
+
+
+def _forged(issued, trust_level="low"):
+    # Структурно корректный Fernet-токен с заданным timestamp (без валидного HMAC)
+    raw = b"\x80" + struct.pack(">Q", issued) + b"\0" * (16 + 16 + 32)
+    token = base64.urlsafe_b64encode(raw)
+    return json.dumps(
+        {
+            "ciphertext": base64.b64encode(token).decode(),
+            "salt": base64.b64encode(b"\0" * 16).decode(),
+            "trust_level": trust_level,
+        }
+    ).encode()
+
+
+@pytest.fixture
+def no_crypto(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("prefilter must reject before decryption")
+
+    monkeypatch.setattr(emitter_bridge, "decrypt_onto16r_token", fail)
+
+
+def test_valid_payload_is_accepted():
+    bridge = EmitterBridge()
+    assert bridge.receive_onto16r(_payload()) == {"signal_id": "urn:onto:sig:test"}
+    assert bridge.rejection_counts() == {}
+
+
+@pytest.mark.parametrize(
+    "payload, reason",
+    [
+        (b"x" * 70000, emitter_bridge.OVERSIZED),
+        (b"not json", emitter_bridge.MALFORMED),
+        (b"[]", emitter_bridge.MALFORMED),
+        (
+            json.dumps({"ciphertext": "!!", "salt": "", "trust_level": "low"}).encode(),
+            emitter_bridge.MALFORMED,
+        ),
+        (_forged(int(time.time()), trust_level="unknown"), emitter_bridge.TRUST_MISMATCH),
+    ],
+)
+def test_junk_is_rejected_before_crypto(no_crypto, payload, reason):
+    bridge = EmitterBridge()
+    assert bridge.receive_onto16r(payload) is None
+    assert bridge.rejection_counts() == {reason: 1}
+
+
+def test_trust_level_floor(no_crypto):
+    bridge = EmitterBridge(trust_level=2)
+    assert bridge.prefilter(_forged(int(time.time()), "low")) == emitter_bridge.TRUST_MISMATCH
+    assert bridge.prefilter(_forged(int(time.time()), "medium")) is None
+
+
+def test_expired_and_future_tokens(no_crypto):
+    bridge = EmitterBridge(token_ttl=60)
+    now = int(time.time())
+    assert bridge.prefilter(_forged(now - 3600)) == emitter_bridge.EXPIRED
+    assert bridge.prefilter(_forged(now + 3600)) == emitter_bridge.EXPIRED
+    assert bridge.prefilter(_forged(now)) is None
+
+
+def test_signature_required_for_vma_packages():
+    bridge = EmitterBridge(emitter_secret=SECRET)
+    payload = _payload("vma")
+    signature = VMASigner(payload_secret=SECRET).sign_payload(payload)
+    assert bridge.receive_onto16r(payload) is None
+    assert bridge.receive_onto16r(payload, "00" * 32) is None
+    assert bridge.receive_onto16r(payload, signature) is not None
+    assert bridge.rejection_counts() == {
+        emitter_bridge.MISSING_SIGNATURE: 1,
+        emitter_bridge.INVALID_SIGNATURE: 1,
+    }
+
+
+def test_signature_is_keyed(no_crypto):
+    payload = _forged(int(time.time()), "vma")
+    forged = VMASigner(payload_secret=b"attacker").sign_payload(payload)
+    assert EmitterBridge(emitter_secret=SECRET).prefilter(payload, forged) == (
+        emitter_bridge.INVALID_SIGNATURE
+    )
+    # Без настроенного секрета мост не принимает ни одной подписи
+    valid = VMASigner(payload_secret=SECRET).sign_payload(payload)
+    assert EmitterBridge().prefilter(payload, valid) == emitter_bridge.INVALID_SIGNATURE
+    with pytest.raises(ValueError):
+        VMASigner().sign_payload(payload)
+
+
+def test_decrypt_failures_are_counted():
+    bridge = EmitterBridge()
+    assert bridge.receive_onto16r(_forged(int(time.time()))) is None
+    assert bridge.rejection_counts() == {emitter_bridge.DECRYPT_FAILED: 1}
+
+
+def test_bridge_with_secret_requires_signature_before_crypto(no_crypto):
+    bridge = EmitterBridge(emitter_secret=SECRET)
+    forged = _forged(int(time.time()))
+    assert bridge.receive_onto16r(forged) is None
+    assert bridge.receive_onto16r(forged, "00" * 32) is None
+    assert bridge.rejection_counts() == {
+        emitter_bridge.MISSING_SIGNATURE: 1,
+        emitter_bridge.INVALID_SIGNATURE: 1,
+    }
+    # Только эмиттер, знающий секрет, может довести пакет до PBKDF2
+    signature = VMASigner(payload_secret=SECRET).sign_payload(forged)
+    assert bridge.prefilter(forged, signature) is None
+
+
+def test_signature_requirement_can_be_disabled():
+    bridge = EmitterBridge(emitter_secret=SECRET, require_signature=False)
+    assert bridge.receive_onto16r(_payload()) == {"signal_id": "urn:onto:sig:test"}
+    with pytest.raises(ValueError):
+        EmitterBridge(require_signature=True)
@@ -0,0 +1,71 @@
+import pytest
+from src.core.ontic_index import OnticFactIndex
+
+
+def _signal(signal_id, *facts):
+    return {
+        "signal_id": signal_id,
+        "ontic_facts": [{"predicate": p, "object": o} for p, o in facts],
+    }
+
+
+def test_predicate_and_object_queries():
+    index = OnticFactIndex(window=8)
+    index.add(_signal("s1", ("contraindicated_with", "allergy_penicillin")))
+    index.add(_signal("s2", ("has_symptom", "fever_39C")))
+    index.add(_signal("s3", ("contraindicated_with", "fever_39C")))
+
+    assert index.signals_with_predicate("contraindicated_with") == ["s1", "s3"]
+    assert index.signals_with_object("fever_39C") == ["s2", "s3"]
+    assert index.signals_with_fact("contraindicated_with", "fever_39C") == ["s3"]
+    assert index.signals_with_predicate("unknown") == []
+
+
+def test_sliding_window_evicts_and_releases_ids():
+    index = OnticFactIndex(window=2)
+    index.add(_signal("s1", ("within_zone", "arena_north")))
+    index.add(_signal("s2", ("performed_action", "cast_spell_fireball")))
+    index.add(_signal("s3", ("performed_action", "block")))
+
+    assert len(index) == 2
+    assert index.signals_with_predicate("within_zone") == []
+    assert index.signals_with_object("arena_north") == []
+    assert index.signals_with_predicate("performed_action") == ["s2", "s3"]
+
+
+def test_flag_terms_track_window():
+    index = OnticFactIndex(window=2, flag_terms=("consent",))
+    seq = index.add(_signal("s1", ("requests", "Consent_Form_A")))
+    assert index.is_flagged(seq)
+    assert index.flagged_in_window == 1
+
+    index.add(_signal("s2", ("within_zone", "arena_north")))
+    index.add(_signal("s3", ("within_zone", "arena_south")))
+    assert index.flagged_in_window == 0
+
+
+def test_terms_are_classified_without_fact_indexes():
+    index = OnticFactIndex(window=4, flag_terms=("medical",))
+    seq = index.add({"signal_id": "s1"}, terms=["Medical_Triage"])
+    assert index.is_flagged(seq)
+    assert index.signals_with_predicate("Medical_Triage") == []
+    assert not index.is_flagged(seq + 100)
+
+
+def test_related_signals_share_objects():
+    index = OnticFactIndex(window=4)
+    index.add(_signal("s1", ("has_symptom", "fever_39C")))
+    index.add(_signal("s2", ("within_zone", "arena_north")))
+    seq = index.add(_signal("s3", ("contraindicated_with", "fever_39C")))
+    assert index.related(seq) == ["s1"]
+
+
+def test_malformed_facts_are_skipped():
+    index = OnticFactIndex()
+    index.add({"ontic_facts": ["not a fact", {"predicate": "has_symptom"}]})
+    assert index.signals_with_predicate("has_symptom") == []
+
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError):
+        OnticFactIndex(window=0)
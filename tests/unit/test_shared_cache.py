@@ -0,0 +1,95 @@
+import multiprocessing
+import uuid
+import pytest
+from src.utils import shared_cache
+
+
+@pytest.fixture
+def publisher():
+    pub = shared_cache.SharedCachePublisher(prefix=f"onto-t-{uuid.uuid4().hex[:8]}")
+    yield pub
+    shared_cache.detach()
+    pub.close()
+
+
+def _worker_lookup(prefix, queue):
+    shared_cache.attach(prefix)
+    queue.put(shared_cache.lookup_blob("temperament_bindings")["fallback_architecture"])
+    shared_cache.detach()
+
+
+def test_blobs_are_shared(publisher):
+    assert publisher.publish() == 1
+    shared_cache.attach(publisher.prefix)
+    bindings = shared_cache.lookup_blob("temperament_bindings")
+    assert bindings["fallback_architecture"] == "behav_mod"
+    assert shared_cache.lookup_blob("unknown") is None
+
+
+def test_worker_process_attaches(publisher):
+    publisher.publish()
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_worker_lookup, args=(publisher.prefix, queue))
+    proc.start()
+    assert queue.get(timeout=10) == "behav_mod"
+    proc.join()
+    assert proc.exitcode == 0
+    # Выход рабочего процесса не должен удалять сегмент супервизора
+    shared_cache.attach(publisher.prefix)
+    assert shared_cache.lookup_blob("temperament_bindings") is not None
+
+
+def test_generation_refresh(publisher, tmp_path):
+    source = tmp_path / "bindings.json"
+    source.write_text('{"version": "1"}', encoding="utf-8")
+    publisher.publish(sources={"temperament_bindings": source})
+    reader = shared_cache.attach(publisher.prefix, poll_interval=0)
+    assert shared_cache.lookup_blob("temperament_bindings") == {"version": "1"}
+
+    source.write_text('{"version": "2"}', encoding="utf-8")
+    publisher.publish(sources={"temperament_bindings": source})
+    assert shared_cache.lookup_blob("temperament_bindings") == {"version": "2"}
+    assert reader.generation == 2
+
+
+def test_control_is_polled_not_read_per_lookup(publisher):
+    publisher.publish()
+    reader = shared_cache.attach(publisher.prefix, poll_interval=3600)
+    assert reader.get_blob("temperament_bindings") is not None
+    publisher.publish()
+    assert reader.get_blob("temperament_bindings") is not None
+    assert reader.generation == 1
+
+
+def test_stuck_writer_keeps_current_generation(publisher, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(shared_cache.time, "sleep", sleeps.append)
+    publisher.publish()
+    reader = shared_cache.attach(publisher.prefix, poll_interval=0)
+    assert reader.get_blob("temperament_bindings") is not None
+
+    # Супервизор «умер» посреди записи: seq остался нечётным
+    shared_cache.struct.pack_into(">Q", publisher._control.buf, 0, 3)
+    assert reader.get_blob("temperament_bindings") is not None
+    assert len(sleeps) == shared_cache._CONTROL_RETRIES - 1
+    # Зависший сегмент больше не ожидается: одна попытка на проверку
+    for _ in range(10):
+        assert reader.get_blob("temperament_bindings") is not None
+    assert len(sleeps) == shared_cache._CONTROL_RETRIES - 1
+    assert reader.generation == 1
+
+    # Запись завершилась — читатель снова видит новые поколения
+    shared_cache.struct.pack_into(">Q", publisher._control.buf, 0, 2)
+    publisher.publish()
+    assert reader.get_blob("temperament_bindings") is not None
+    assert reader.generation == 2
+
+
+def test_long_prefix_is_rejected():
+    with pytest.raises(ValueError):
+        shared_cache.SharedCachePublisher(prefix="onto-transponder-cluster-eu-west-1a")
+
+
+def test_lookup_without_attach_returns_none():
+    shared_cache.detach()
+    assert shared_cache.lookup_blob("temperament_bindings") is None
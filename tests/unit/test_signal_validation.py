@@ -1,5 +1,5 @@
 import pytest
-from src.core.signal_validator import validate_signal
+from src.core.signal_validator import SignalValidator, batch_validator, validate_signal
 import json
 import os
 
@@ -21,4 +21,18 @@ def test_malformed_signal():
     signal = "not a dict"
     spec_path = os.path.join("specs", "signal-schema.json")
     with pytest.raises(TypeError):
-        validate_signal(signal, spec_path)
\ No newline at end of file
+        validate_signal(signal, spec_path)
+
+
+def test_batch_validator_builds_validator_once(monkeypatch):
+    schema = {"type": "object", "required": ["intent"]}
+    monkeypatch.setattr(SignalValidator, "_schema", schema)
+    monkeypatch.setattr(SignalValidator, "_validator", None)
+
+    is_valid = batch_validator("signal-schema.json")
+    assert is_valid({"intent": "query"}) is True
+    assert is_valid({"source": "emitter"}) is False
+    with pytest.raises(TypeError):
+        is_valid("not a dict")
+    assert SignalValidator.validator() is SignalValidator.validator()
+    assert validate_signal({"intent": "query"}) is True
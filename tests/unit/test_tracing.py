@@ -0,0 +1,118 @@
+import json
+import os
+import signal
+import pytest
+from src.interfaces.emitter_bridge import EmitterBridge
+from src.protocols.vma_signer import VMASigner
+from src.utils import tracing
+from src.utils.crypto_utils import encrypt_onto16r
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    tracing.disable()
+
+
+def test_disabled_tracing_is_noop():
+    assert tracing.span("anything") is tracing._NOOP
+
+
+def test_unsampled_traces_are_dropped():
+    sink = tracing.RingBufferSink()
+    tracing.configure(sink, sample_rate=0.0)
+    VMASigner().sign({"signal_id": "s1"}, phase_id="p1")
+    assert sink.spans() == []
+
+
+def test_children_inherit_sampling_decision():
+    sink = tracing.RingBufferSink()
+    tracing.configure(sink, sample_rate=0.5)
+    for _ in range(200):
+        with tracing.span("root"):
+            with tracing.span("child"):
+                with tracing.span("grandchild"):
+                    pass
+
+    spans = sink.spans()
+    roots = {span["trace_id"] for span in spans if span["parent_id"] is None}
+    assert 0 < len(roots) < 200
+    assert all(span["name"] == "root" for span in spans if span["parent_id"] is None)
+    assert all(span["trace_id"] in roots for span in spans)
+    assert len(spans) == 3 * len(roots)
+
+
+def test_signal_path_spans_are_nested():
+    package = encrypt_onto16r(json.dumps({"signal_id": "s1"}), "low")
+    sink = tracing.RingBufferSink()
+    tracing.configure(sink, sample_rate=1.0)
+
+    assert EmitterBridge().receive_onto16r(json.dumps(package).encode()) is not None
+
+    spans = {span["name"]: span for span in sink.spans()}
+    root = spans["emitter_bridge.receive_onto16r"]
+    assert root["parent_id"] is None
+    assert root["attrs"]["accepted"] is True
+    assert spans["crypto_utils.decrypt_onto16r"]["parent_id"] == root["span_id"]
+    assert spans["crypto_utils.derive_key"]["trace_id"] == root["trace_id"]
+
+
+def test_file_sink_writes_ndjson(tmp_path):
+    path = tmp_path / "traces.ndjson"
+    tracing.configure_from_config({"sample_rate": 1.0, "sink": "file", "path": str(path)})
+    VMASigner().sign({"signal_id": "s1"}, phase_id="p1")
+    tracing.disable()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["vma_signer.sign"]
+
+
+def test_file_sink_flushes_each_span(tmp_path):
+    path = tmp_path / "traces.ndjson"
+    tracing.configure_from_config({"sample_rate": 1.0, "sink": "file", "path": str(path)})
+    VMASigner().sign({"signal_id": "s1"}, phase_id="p1")
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_span_sink_requires_export():
+    with pytest.raises(TypeError):
+        tracing.SpanSink()
+
+
+def test_profile_window_writes_snapshots(tmp_path):
+    window = tracing.start_profile_window(duration=0.2, output_dir=str(tmp_path))
+    VMASigner().sign({"signal_id": "s1"}, phase_id="p1")
+    assert window.wait(timeout=5)
+
+    names = sorted(path.suffix for path in window.results)
+    assert names == [".pstats", ".txt"]
+    assert tracing.span("after") is tracing._NOOP
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="SIGUSR2 is POSIX-only")
+def test_profile_signal_from_config_opens_window(tmp_path):
+    previous = signal.getsignal(signal.SIGUSR2)
+    try:
+        tracing.configure_from_config(
+            {
+                "profile_signal": "SIGUSR2",
+                "profile_duration": 0.2,
+                "profile_dir": str(tmp_path),
+            }
+        )
+        assert tracing.current_tracer() is None
+        os.kill(os.getpid(), signal.SIGUSR2)
+
+        window = tracing.current_profile_window()
+        assert window is not None
+        VMASigner().sign({"signal_id": "s1"}, phase_id="p1")
+        assert window.wait(timeout=5)
+        assert window.results
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+
+def test_unknown_profile_signal_is_rejected():
+    with pytest.raises(ValueError):
+        tracing.configure_from_config({"profile_signal": "SIGNOPE"})